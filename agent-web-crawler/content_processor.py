@@ -1,17 +1,23 @@
-from bs4 import BeautifulSoup
-from langchain_openai import OpenAI
 import os
+from utils import lazy_import
 
 class ContentProcessor:
     def __init__(self):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         if not self.openai_api_key:
             raise EnvironmentError("OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
-        self.llm = OpenAI(api_key=self.openai_api_key)
+        self._llm = None
+
+    @property
+    def llm(self):
+        """LangChain OpenAI client, imported and created on first use."""
+        if self._llm is None:
+            self._llm = lazy_import("langchain_openai").OpenAI(api_key=self.openai_api_key)
+        return self._llm
 
     def clean_content(self, html_content):
         """Clean and extract text from HTML content using BeautifulSoup."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = lazy_import("bs4").BeautifulSoup(html_content, 'html.parser')
         for script in soup(["script", "style"]):
             script.decompose()  # Remove these two elements and their contents
         text = soup.get_text(separator=' ', strip=True)
@@ -1,11 +1,13 @@
-import aiofiles
 import asyncio
 import subprocess
 import csv
 import os
 import re
 import json
+from array import array
 from settings import DEFAULT_STATE_FILE
+from url_canonicalizer import UrlFingerprintSet
+from utils import lazy_import
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,11 @@ logger = logging.getLogger(__name__)
 class FileManager:
     def __init__(self, state_file: str):
         self.state_file = state_file
+        # Canonical sites are appended here one per line as they are processed
+        self.processed_journal = f"{state_file}.journal"
+        # Derived cache of the seen-set: an array('Q') whose first item is the journal byte
+        # offset it covers, followed by the sorted site fingerprints. Safe to delete.
+        self.fingerprint_cache = f"{state_file}.fingerprints"
         self.lock = asyncio.Lock()  # Ensure the lock is initialized
         self.cached_content_dir = "data/cached_content"
         self.cached_content_index = "data/cached_content_index.csv"
@@ -100,6 +107,7 @@ class FileManager:
 
 # Write to CSV
     async def write_to_csv(self, file_path: str, data: list):
+        aiofiles = lazy_import("aiofiles")
         async with self.lock, aiofiles.open(file_path, mode='a', newline='') as file:
             writer = csv.writer(file)
             try:
@@ -120,34 +128,89 @@ class FileManager:
             logger.warning(f"State file not found or invalid. Initializing new state: {e}")
             return {'processed_urls': []}
 
-    def save_state(self, state: dict):
+    def save_state(self, state: dict) -> bool:
         try:
             with open(self.state_file, 'w') as file:
                 json.dump(state, file)
                 logger.info(f"State saved successfully to {self.state_file}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save state to {self.state_file}: {e}")
+            return False
 
     def get_processed_urls(self, state_file: str = None) -> list:
         try:
             if state_file is None:
                 state_file = self.state_file
             state = self.load_state()
-            processed_urls = state.get('processed_urls', [])
+            processed_urls = state.get('processed_urls', []) + self.read_processed_journal(0)[0]
             logger.info(f"Processed URLs retrieved from {state_file}")
             return processed_urls
         except Exception as e:
             logger.error(f"Failed to get processed URLs from {state_file}: {e}")
             return []
 
-    def update_processed_urls(self, state_file: str, url: str):
+    def load_processed_fingerprints(self) -> UrlFingerprintSet:
+        """Load the seen-set of processed sites from the fingerprint cache and any newer journal entries."""
+        cache = self.load_fingerprint_cache()
+        if cache is None:
+            # No cache yet: build it once from the legacy state list (raw URLs) and the whole journal
+            journal_offset = 0
+            fingerprints = UrlFingerprintSet(self.load_state().get('processed_urls', []))
+        else:
+            journal_offset, fingerprints = cache
+
+        sites, new_offset = self.read_processed_journal(journal_offset)
+        fingerprints.update(sites, canonical=True)
+        if cache is None or new_offset != journal_offset:
+            self.save_fingerprint_cache(new_offset, fingerprints)
+        logger.info(f"Loaded {len(fingerprints)} processed sites")
+        return fingerprints
+
+    def load_fingerprint_cache(self):
         try:
-            state = self.load_state()
-            processed_urls = state.get('processed_urls', [])
-            if url not in processed_urls:
-                processed_urls.append(url)
-                state['processed_urls'] = processed_urls
-                self.save_state(state)
-                logger.info(f"URL '{url}' added to processed URLs in {state_file}")
+            data = array('Q')
+            with open(self.fingerprint_cache, 'rb') as file:
+                data.frombytes(file.read())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning(f"Fingerprint cache {self.fingerprint_cache} is invalid, rebuilding it: {e}")
+            return None
+        if not data:
+            return None
+        return data[0], UrlFingerprintSet.from_array(data[1:])
+
+    def save_fingerprint_cache(self, journal_offset: int, fingerprints: UrlFingerprintSet):
+        data = array('Q', [journal_offset])
+        data.extend(fingerprints.to_array())
+        temp_file = f"{self.fingerprint_cache}.tmp"
+        try:
+            with open(temp_file, 'wb') as file:
+                data.tofile(file)
+            os.replace(temp_file, self.fingerprint_cache)
+        except Exception as e:
+            logger.error(f"Failed to save fingerprint cache to {self.fingerprint_cache}: {e}")
+
+    def read_processed_journal(self, offset: int):
+        """Return the journal entries after byte offset and the offset of the last complete line."""
+        try:
+            with open(self.processed_journal, 'rb') as file:
+                if offset > os.fstat(file.fileno()).st_size:
+                    offset = 0  # The journal was replaced; read it again from the start
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            return [], 0
+        complete = data[:data.rfind(b'\n') + 1]
+        sites = [line.strip() for line in complete.decode('utf-8').splitlines() if line.strip()]
+        return sites, offset + len(complete)
+
+    def update_processed_urls(self, state_file: str, site: str):
+        """Append a processed canonical site to the journal; callers check their in-memory seen-set first."""
+        try:
+            with open(self.processed_journal, 'a', encoding='utf-8') as file:
+                file.write(site + '\n')
+            logger.info(f"URL '{site}' added to processed URLs in {state_file}")
         except Exception as e:
-            logging.error(f"Failed to update processed URLs in {state_file} with URL '{url}': {e}")
\ No newline at end of file
+            logging.error(f"Failed to update processed URLs in {state_file} with URL '{site}': {e}")
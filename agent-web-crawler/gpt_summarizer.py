@@ -1,7 +1,6 @@
 import re
-import openai
-from openai import AsyncOpenAI
 import logging
+from utils import lazy_import
 from settings import OPENAI_API_KEY, MODEL, MAX_OUTPUT_TOKENS
 
 # Setup logging
@@ -9,8 +8,14 @@ logger = logging.getLogger(__name__)
 
 class GPTSummarizer:
     def __init__(self):
-        # Create an instance of the AsyncOpenAI class
-        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        # The AsyncOpenAI client is created on the first request
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = lazy_import("openai").AsyncOpenAI(api_key=OPENAI_API_KEY)
+        return self._client
 
     async def summarize(self, content: str, purpose: str = "summary", heuristics=None) -> str:
         if content is None or "Already processed" in content or "Error in processing" in content:
@@ -2,10 +2,8 @@ import asyncio
 import sys
 import argparse
 import logging
-import pandas as pd
 import csv
 from asyncio import Semaphore
-from web_scraper import WebScraper
 from settings import (
     DEFAULT_STATE_FILE,
     DEFAULT_INPUT_FILE,
@@ -14,30 +12,63 @@ from settings import (
     MAX_CONCURRENT_BROWSERS,
     DEFAULT_LOG_FILE
 )
-from utils import setup_logging
-
-# Set up logging at the start of the orchestrator main function
-setup_logging(LOG_LEVEL, DEFAULT_LOG_FILE)
-
-# Now import other modules that may use logging
-from web_scraper import WebScraper
-from gpt_summarizer import GPTSummarizer
-from file_manager import FileManager
+from utils import setup_logging, StartupProfiler
+from url_canonicalizer import canonicalize_url
 
 logger = logging.getLogger(__name__)
 
-async def main(args):
-    logger.info("Starting the application...")
-
-    gpt_summarizer = GPTSummarizer()
-    file_manager = FileManager(args.state)
-
-    # Retrieve processed URLs before creating the WebScraper instance
-    processed_urls = file_manager.get_processed_urls(args.state)
-    web_scraper = WebScraper(gpt_summarizer, file_manager, processed_urls)
+def read_input_sites(input_file):
+    """Read the Name/URL input CSV and group its rows by canonical site."""
+    sites = {}
+    with open(input_file, 'r', newline='', encoding='utf-8-sig') as file:
+        for row in csv.DictReader(file):
+            name, url = row.get('Name') or '', (row.get('URL') or '').strip()
+            if not url:
+                logger.warning(f"Skipping input row without URL: {row}")
+                continue
+            sites.setdefault(canonicalize_url(url), []).append((name, url))
+    return sites
 
-    # Load the input CSV file into a pandas DataFrame
-    data = pd.read_csv(args.input)
+async def main(args, profiler=None):
+    logger.info("Starting the application...")
+    if profiler is None:
+        profiler = StartupProfiler(args.profile_startup)
+
+    # Only the light modules are needed to work out which sites still have to be processed
+    with profiler.measure("import file_manager"):
+        from file_manager import FileManager
+
+    with profiler.measure("init FileManager"):
+        file_manager = FileManager(args.state)
+        processed_urls = file_manager.load_processed_fingerprints()
+
+    # Group input rows that point at the same canonical site so each site is fetched once
+    with profiler.measure("read input"):
+        sites = read_input_sites(args.input)
+
+    pending_sites = {}
+    for site, rows in sites.items():
+        # Check if the site has already been processed
+        if site in processed_urls:
+            logger.info(f"Skipping {site}, already processed.")
+            continue
+        pending_sites[site] = rows
+
+    if not pending_sites:
+        profiler.report()
+        logger.info("No new URLs to process.")
+        return
+
+    # The scraper and summarizer are only built when there is work for them
+    with profiler.measure("import gpt_summarizer"):
+        from gpt_summarizer import GPTSummarizer
+    with profiler.measure("import web_scraper"):
+        from web_scraper import WebScraper
+    with profiler.measure("init GPTSummarizer"):
+        gpt_summarizer = GPTSummarizer()
+    with profiler.measure("init WebScraper"):
+        web_scraper = WebScraper(gpt_summarizer, file_manager, processed_urls)
+    profiler.report()
 
     # Semaphore to control concurrency
     semaphore = Semaphore(args.max_concurrent_browsers)
@@ -52,17 +83,13 @@ async def main(args):
         if csvfile.tell() == 0:
             writer.writeheader()
 
-        # Process each URL in the DataFrame
+        # Process each site in the input file
         tasks = []
-        for index, row in data.iterrows():
-            name, url = row['Name'], row['URL']
-            
-            # Check if the URL has already been processed
-            if url in file_manager.get_processed_urls(args.state):
-                logger.info(f"Skipping {url}, already processed.")
-                continue
-            
-            task = asyncio.create_task(process_with_semaphore(name, url, args.output, args.state, writer, semaphore, web_scraper, csvfile, args.refresh))
+        for site, rows in pending_sites.items():
+            if len(rows) > 1:
+                logger.info(f"{len(rows)} input rows resolve to {site}, fetching it once.")
+
+            task = asyncio.create_task(process_with_semaphore(rows, args.output, args.state, writer, semaphore, web_scraper, csvfile, args.refresh))
             tasks.append(task)
 
         try:
@@ -72,10 +99,12 @@ async def main(args):
             # Close the CSV file and exit the event loop
             csvfile.close()
 
+    profiler.report_lazy_imports()
     logger.info(f"Results saved and cleaned in {args.output}")
 
-async def process_with_semaphore(name, url, output, state, writer, semaphore, web_scraper, csvfile, refresh):
+async def process_with_semaphore(rows, output, state, writer, semaphore, web_scraper, csvfile, refresh):
     async with semaphore:
+        name, url = rows[0]
         result = await web_scraper.process_url(name, url, output, state, refresh)
 
         if result[2] == "Already processed":
@@ -87,30 +116,29 @@ async def process_with_semaphore(name, url, output, state, writer, semaphore, we
             return
 
         elif len(result) == 7:
-            name, url, summary, pricing, analysis, score, fuzzy_score = result
+            _, _, summary, pricing, analysis, score, fuzzy_score = result
             # Process each field if necessary (e.g., stripping extra characters, handling newlines)
-            name = name.strip()
-            url = url.strip()
             summary = summary.replace('\n', ' ').strip()
             pricing = pricing.replace('\n', ' ').strip()
             analysis_text = analysis.replace('\n', ' ').strip() if analysis else "Analysis not available"
         else:
-            name, url, summary, pricing = result
+            _, _, summary, pricing = result
             analysis_text, score, fuzzy_score = "Analysis not available", None, None
-        
+
         try:
-            # Write the result to the CSV file immediately
-            writer.writerow({
-                'Name': name,
-                'URL': url,
-                'Summary': summary,
-                'Pricing': pricing,
-                'Analysis': analysis_text,
-                'Score': score,
-                'FuzzyScore': fuzzy_score
-            })
-            
-            # Ensure the data is flushed to the file  
+            # Write the result to the CSV file immediately, once for every input row of this site
+            for name, url in rows:
+                writer.writerow({
+                    'Name': name.strip(),
+                    'URL': url.strip(),
+                    'Summary': summary,
+                    'Pricing': pricing,
+                    'Analysis': analysis_text,
+                    'Score': score,
+                    'FuzzyScore': fuzzy_score
+                })
+
+            # Ensure the data is flushed to the file
             csvfile.flush()
         except Exception as e:
             logger.error(f"Error writing result to CSV: {str(e)}")
@@ -122,10 +150,16 @@ if __name__ == '__main__':
     parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT_FILE, help="Path to the output CSV file")
     parser.add_argument("--max-concurrent-browsers", type=int, default=MAX_CONCURRENT_BROWSERS, help="Maximum number of concurrent browser instances")
     parser.add_argument("--refresh", action="store_true", help="Force refresh of cached content")
+    parser.add_argument("--profile-startup", action="store_true", help="Report import and initialization time per module")
     args = parser.parse_args()
 
+    profiler = StartupProfiler(args.profile_startup)
+
+    with profiler.measure("setup_logging"):
+        setup_logging(LOG_LEVEL, DEFAULT_LOG_FILE)
+
     # Set the event loop policy to WindowsSelectorEventLoopPolicy for Windows compatibility
     if sys.platform.startswith('win'):
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-    asyncio.run(main(args))
\ No newline at end of file
+    asyncio.run(main(args, profiler))
\ No newline at end of file
@@ -0,0 +1,105 @@
+import pytest
+from url_canonicalizer import canonicalize_url, UrlFingerprintSet
+from orchestrator import read_input_sites
+from file_manager import FileManager
+
+
+@pytest.mark.parametrize("url", [
+    "https://jasper.ai",
+    "http://jasper.ai",
+    "https://www.jasper.ai",
+    "https://jasper.ai/",
+    "http://WWW.Jasper.AI/",
+    "jasper.ai",
+    "https://jasper.ai:443/",
+    "https://jasper.ai/?utm_source=newsletter&utm_medium=email",
+    "https://jasper.ai/?gclid=abc&fbclid=def#pricing",
+    "  https://jasper.ai  ",
+])
+def test_canonicalize_url_variants_of_one_site(url):
+    assert canonicalize_url(url) == "https://jasper.ai"
+
+
+def test_canonicalize_url_keeps_content_selecting_parts():
+    assert canonicalize_url("https://example.com:8080/docs/") == "https://example.com:8080/docs"
+    assert canonicalize_url("https://example.com/?b=2&a=1") == "https://example.com?a=1&b=2"
+    assert canonicalize_url("https://github.com/org/repo?ref=dev") == "https://github.com/org/repo?ref=dev"
+
+
+def test_canonicalize_url_ipv6_host():
+    assert canonicalize_url("http://[::1]:8443/a/") == "https://[::1]:8443/a"
+    assert canonicalize_url("https://[2001:DB8::1]:443") == "https://[2001:db8::1]"
+
+
+@pytest.mark.parametrize("url", [
+    "mailto:x@y.com",
+    "about:blank",
+    "ftp://example.com/file",
+    "example.com:abc",
+    "http://[::1",
+])
+def test_canonicalize_url_leaves_other_urls_unchanged(url):
+    assert canonicalize_url(" " + url + " ") == url
+
+
+def test_canonicalize_url_is_idempotent():
+    canonical = canonicalize_url("http://www.example.com:8080/a/?utm_id=1&q=x")
+    assert canonicalize_url(canonical) == canonical
+
+
+def test_fingerprint_set_membership_across_merge(monkeypatch):
+    monkeypatch.setattr(UrlFingerprintSet, "MERGE_THRESHOLD", 4)
+    fingerprints = UrlFingerprintSet(["http://www.site0.com/"])
+    for i in range(1, 10):
+        fingerprints.add(f"https://site{i}.com")
+    fingerprints.add("https://www.site3.com/")
+
+    assert len(fingerprints) == 10
+    assert all(f"site{i}.com" in fingerprints for i in range(10))
+    assert "https://site10.com" not in fingerprints
+    merged = fingerprints.to_array()
+    assert list(merged) == sorted(set(merged))
+
+
+def test_fingerprint_set_canonical_entries_and_array_round_trip():
+    fingerprints = UrlFingerprintSet(["https://jasper.ai", "https://canva.com"], canonical=True)
+    fingerprints.add("https://prisma-ai.com/lensa", canonical=True)
+
+    restored = UrlFingerprintSet.from_array(fingerprints.to_array())
+    assert "http://www.jasper.ai/" in restored
+    assert "https://prisma-ai.com/lensa/" in restored
+    assert "https://example.com" not in restored
+
+
+def test_read_input_sites_groups_rows_by_site(tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text(
+        "Name,URL\n"
+        "Jasper,https://www.jasper.ai/\n"
+        "Canva,https://www.canva.com/\n"
+        "Jasper again,http://jasper.ai?utm_source=x\n"
+        "Missing,\n",
+        encoding="utf-8",
+    )
+
+    sites = read_input_sites(str(input_file))
+
+    assert sites == {
+        "https://jasper.ai": [("Jasper", "https://www.jasper.ai/"), ("Jasper again", "http://jasper.ai?utm_source=x")],
+        "https://canva.com": [("Canva", "https://www.canva.com/")],
+    }
+
+
+def test_processed_fingerprints_persist_across_runs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "state.json").write_text('{"processed_urls": ["http://www.jasper.ai/"]}')
+
+    file_manager = FileManager("data/state.json")
+    assert "https://jasper.ai" in file_manager.load_processed_fingerprints()
+    file_manager.update_processed_urls("data/state.json", "https://canva.com")
+
+    processed = FileManager("data/state.json").load_processed_fingerprints()
+    assert "https://jasper.ai" in processed
+    assert "https://www.canva.com/" in processed
+    assert len(processed) == 2
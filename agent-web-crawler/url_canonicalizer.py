@@ -0,0 +1,138 @@
+import hashlib
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Campaign and click-id parameters that only track the visitor and never change the page content.
+# Generic names such as "ref" are left alone because sites like GitHub use them to select content.
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid", "_ga", "_hsenc", "_hsmi"}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# "mailto:", "about:" and friends; "example.com:8080" is a host with a port, not a scheme
+NON_HTTP_SCHEME = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:(?!\d)")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so that variants of the same site compare equal.
+
+    Forces https, lowercases the host, drops "www.", default ports, fragments,
+    trailing slashes and tracking parameters, and sorts the remaining query.
+    Only http(s) URLs are normalized; anything else, including URLs that
+    cannot be parsed, is returned stripped but otherwise unchanged.
+    """
+    raw_url = url.strip()
+    if "://" in raw_url:
+        url = raw_url
+    elif NON_HTTP_SCHEME.match(raw_url):
+        return raw_url
+    else:
+        url = "https://" + raw_url
+
+    try:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS:
+            return raw_url
+
+        host = (parts.hostname or "").rstrip(".")
+        if host.startswith("www."):
+            host = host[4:]
+        port = str(parts.port) if parts.port else ""
+    except ValueError:
+        return raw_url
+
+    # hostname strips the brackets from IPv6 literals; put them back so the port stays unambiguous
+    if ":" in host:
+        host = f"[{host}]"
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+
+    query_pairs = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(query_pairs))
+
+    return urlunsplit(("https", host, path, query, ""))
+
+
+class UrlFingerprintSet:
+    """Compact seen-set of canonical URLs.
+
+    Stores a 64-bit blake2b fingerprint per URL in a sorted array('Q'), i.e.
+    8 bytes per URL instead of a Python string (~100+ bytes) in a set. URLs
+    added during a run go to a small set that is merged into the array once it
+    grows past MERGE_THRESHOLD. Lookups are a binary search.
+
+    Fingerprints can collide: the birthday bound gives roughly n**2 / 2**65,
+    about 2.7e-6 at 10 million URLs. A collision is a false positive, so the
+    colliding site is skipped as "already processed" without ever being fetched.
+    """
+
+    MERGE_THRESHOLD = 65536
+
+    def __init__(self, urls=(), canonical: bool = False):
+        """Build the set from urls; pass canonical=True to skip re-canonicalizing them."""
+        fingerprint = self._hash if canonical else self._fingerprint
+        self._fingerprints = array("Q", sorted({fingerprint(url) for url in urls}))
+        self._pending = set()
+
+    @classmethod
+    def from_array(cls, fingerprints: array) -> "UrlFingerprintSet":
+        """Wrap a sorted, duplicate-free array('Q') as produced by to_array()."""
+        fingerprint_set = cls()
+        fingerprint_set._fingerprints = fingerprints
+        return fingerprint_set
+
+    @staticmethod
+    def _hash(canonical_url: str) -> int:
+        digest = hashlib.blake2b(canonical_url.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    @classmethod
+    def _fingerprint(cls, url: str) -> int:
+        return cls._hash(canonicalize_url(url))
+
+    def _in_array(self, fingerprint: int) -> bool:
+        index = bisect_left(self._fingerprints, fingerprint)
+        return index < len(self._fingerprints) and self._fingerprints[index] == fingerprint
+
+    def _merge_pending(self):
+        # Pending fingerprints are never in the array, so a streaming merge keeps it sorted and unique
+        merged = array("Q")
+        merged.extend(heapq.merge(self._fingerprints, sorted(self._pending)))
+        self._fingerprints = merged
+        self._pending = set()
+
+    def _add_fingerprint(self, fingerprint: int):
+        if fingerprint in self._pending or self._in_array(fingerprint):
+            return
+        self._pending.add(fingerprint)
+        if len(self._pending) >= self.MERGE_THRESHOLD:
+            self._merge_pending()
+
+    def add(self, url: str, canonical: bool = False):
+        self._add_fingerprint(self._hash(url) if canonical else self._fingerprint(url))
+
+    def update(self, urls, canonical: bool = False):
+        for url in urls:
+            self.add(url, canonical)
+
+    def to_array(self) -> array:
+        """Return all fingerprints as one sorted array('Q'), e.g. for array.tofile()."""
+        if self._pending:
+            self._merge_pending()
+        return self._fingerprints
+
+    def __contains__(self, url: str) -> bool:
+        fingerprint = self._fingerprint(url)
+        return fingerprint in self._pending or self._in_array(fingerprint)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints) + len(self._pending)
@@ -1,6 +1,9 @@
 import asyncio
+import importlib
 import logging
 import sys
+import time
+from contextlib import contextmanager
 
 def exponential_backoff(attempt: int, base_delay: float = 1.0, max_delay: float = 60.0) -> float:
     delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
@@ -45,4 +48,54 @@ def setup_logging(log_level, log_file=None):
     logger.addHandler(stream_handler)
     
     # Set the logging level for the root logger
-    logger.setLevel(log_level)
\ No newline at end of file
+    logger.setLevel(log_level)
+
+# First-use import time of each lazily imported dependency, in import order
+LAZY_IMPORT_TIMINGS = []
+
+def lazy_import(module_name: str):
+    """Import a heavy dependency on first use and record how long the import took."""
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        LAZY_IMPORT_TIMINGS.append((module_name, time.perf_counter() - start))
+    return module
+
+class StartupProfiler:
+    """Times import and initialization steps and reports them when enabled.
+
+    Module-level imports of the entry point happen before the profiler exists
+    and are not included; use python -X importtime for those.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.timings = []
+
+    @contextmanager
+    def measure(self, label: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((label, time.perf_counter() - start))
+
+    def report(self):
+        if not self.enabled:
+            return
+        logger = logging.getLogger(__name__)
+        for label, elapsed in self.timings:
+            logger.info(f"Startup: {label:<32} {elapsed * 1000:8.1f} ms")
+        total = time.perf_counter() - self.started
+        logger.info(f"Startup: {'total after module imports':<32} {total * 1000:8.1f} ms")
+        logger.info("Startup: module-level imports and interpreter startup are not included; run with python -X importtime for those")
+
+    def report_lazy_imports(self):
+        """Report heavy dependencies that were imported on first use during the run."""
+        if not self.enabled:
+            return
+        logger = logging.getLogger(__name__)
+        for module_name, elapsed in LAZY_IMPORT_TIMINGS:
+            logger.info(f"Lazy import: {module_name:<27} {elapsed * 1000:8.1f} ms")
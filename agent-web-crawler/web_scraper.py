@@ -1,32 +1,74 @@
 import asyncio
-from playwright.async_api import async_playwright
 from urllib.parse import urljoin
 import logging
 from gpt_summarizer import GPTSummarizer
 from file_manager import FileManager
-from utils import exponential_backoff
+from utils import exponential_backoff, lazy_import
 from settings import BROWSER_EXECUTABLE_PATH, BROWSER_ARGS, MAX_INPUT_TOKENS
 from content_processor import ContentProcessor
+from url_canonicalizer import canonicalize_url, UrlFingerprintSet
 
 logger = logging.getLogger(__name__)
 
 class WebScraper:
-    def __init__(self, gpt_summarizer: GPTSummarizer, file_manager: FileManager, processed_urls: set):
+    def __init__(self, gpt_summarizer: GPTSummarizer, file_manager: FileManager, processed_urls: UrlFingerprintSet):
         self.gpt_summarizer = gpt_summarizer
         self.file_manager = file_manager
         self.content_processor = ContentProcessor()
         self.processed_urls = processed_urls
+        # Canonical site -> future holding the result of the one fetch for that site
+        self.site_results = {}
+        # Canonical input site -> canonical site it finally landed on after redirects
+        self.final_urls = {}
+        # Future of a site being processed -> future of the redirect target it is waiting on
+        self.waiting_for = {}
 
     async def process_url(self, name: str, url: str, output_file: str, state_file: str, refresh: bool = False, max_retries: int = 3):
+        site = canonicalize_url(url)
+
+        # Reuse the result if this site (or a redirect to it) is already being processed in this run
+        if site in self.site_results:
+            logger.info(f"Reusing result for {url}, same site as a previously processed URL.")
+            result = await self.site_results[site]
+            return (name, url) + tuple(result[2:])
+
         # Skip if already processed
-        if url in self.processed_urls:
+        if site in self.processed_urls:
             logger.info(f"Skipping {url}, already processed.")
             result = (name, url, "Already processed", "N/A")
             print(f"Returning: {result}")
             return result
-        
+
+        future = asyncio.get_running_loop().create_future()
+        self.site_results[site] = future
+        try:
+            result = await self.process_site(name, url, site, output_file, state_file, refresh, max_retries)
+        except asyncio.CancelledError:
+            self.forget_failed_site(site, future)
+            future.cancel()
+            raise
+        except Exception as e:
+            self.forget_failed_site(site, future)
+            if not future.done():
+                future.set_exception(e)
+                # Mark the exception as retrieved; rows waiting on this site still get it when they await
+                future.exception()
+            raise
+        if result[2] == "Error in processing":
+            self.forget_failed_site(site, future)
+        if not future.done():
+            future.set_result(result)
+        return result
+
+    def forget_failed_site(self, site: str, future: asyncio.Future):
+        """Stop later rows for this site, or redirecting to its final URL, from reusing a failed result."""
+        for key in (site, self.final_urls.get(site)):
+            if key and self.site_results.get(key) is future:
+                del self.site_results[key]
+
+    async def process_site(self, name: str, url: str, site: str, output_file: str, state_file: str, refresh: bool, max_retries: int):
         # Check if content is cached and refresh is not requested
-        if not refresh and url not in self.processed_urls and self.file_manager.is_content_cached(url):
+        if not refresh and self.file_manager.is_content_cached(url):
             logger.info(f"Loading cached content for {url}")
             main_content, pricing_content = self.file_manager.get_cached_content(url)
             
@@ -38,18 +80,18 @@ class WebScraper:
                 combined_content = main_content + " " + pricing_content
                 score, fuzzy_score, analysis = await self.gpt_summarizer.summarize(combined_content, purpose="scoring")
                 # Update the state file to mark the URL as processed
-                self.file_manager.update_processed_urls(state_file, url)
+                self.mark_processed(state_file, site)
                 return (name, url, summary, pricing, analysis, score, fuzzy_score)
             else:
                 logger.info(f"Cached content for {url} is empty. Refreshing...")
         
         # If not cached, needs refreshing, or cached content is empty, scrape and summarize
         for attempt in range(1, max_retries + 1):
-            result = await self.scrape_and_summarize(name, url)
+            result = await self.scrape_and_summarize(name, url, site)
             if result and result[2] != "Error in processing":
                 # Write the result to the CSV file asynchronously
                 await self.file_manager.write_to_csv(output_file, result)
-                self.file_manager.update_processed_urls(state_file, url)
+                self.mark_processed(state_file, site)
                 return result
             else:
                 logger.error(f"Attempt {attempt} failed for {url}. Retrying after delay...")
@@ -58,13 +100,56 @@ class WebScraper:
         logger.error(f"All attempts failed for {url}.")
         return (name, url, "Error in processing", "Error in processing", "Error in processing", None, None)
 
-    async def scrape_and_summarize(self, name: str, url: str):
+    def mark_processed(self, state_file: str, site: str):
+        """Record the canonical site and, if it redirected, the final site as processed."""
+        if site not in self.processed_urls:
+            self.processed_urls.add(site, canonical=True)
+            self.file_manager.update_processed_urls(state_file, site)
+        final_site = self.final_urls.get(site)
+        if final_site and final_site not in self.processed_urls:
+            self.processed_urls.add(final_site, canonical=True)
+            self.file_manager.update_processed_urls(state_file, final_site)
+
+    def waits_on(self, future: asyncio.Future, other: asyncio.Future) -> bool:
+        """Return True if the site behind future is (transitively) waiting on other."""
+        while future is not None:
+            if future is other:
+                return True
+            future = self.waiting_for.get(future)
+        return False
+
+    async def scrape_and_summarize(self, name: str, url: str, site: str = None):
+        async_playwright = lazy_import("playwright.async_api").async_playwright
+        browser = None
         try:
             async with async_playwright() as p:
                 browser = await p.chromium.launch(executable_path=BROWSER_EXECUTABLE_PATH, args=BROWSER_ARGS)
                 page = await browser.new_page()
                 await page.goto(url, timeout=60000)
 
+                # Record where the URL landed and reuse the result if another input row already reached that site
+                if site is not None:
+                    final_site = canonicalize_url(page.url)
+                    if final_site != site and final_site.startswith("https://"):
+                        logger.info(f"{url} redirected to {page.url}")
+                        self.final_urls[site] = final_site
+                        own_future = self.site_results[site]
+                        target_future = self.site_results.setdefault(final_site, own_future)
+                        if target_future is not own_future and not self.waits_on(target_future, own_future):
+                            self.waiting_for[own_future] = target_future
+                            try:
+                                result = await target_future
+                            except Exception as e:
+                                result = None
+                                logger.warning(f"Processing {final_site} failed: {str(e)}")
+                            finally:
+                                del self.waiting_for[own_future]
+                            if result is not None and result[2] != "Error in processing":
+                                await browser.close()
+                                return (name, url) + tuple(result[2:])
+                            # The shared result failed, but this navigation worked, so scrape the page here
+                            logger.info(f"No usable result for {final_site}, scraping {url} directly.")
+
                 content = await page.content()
                 logger.info(f"Content extracted from {url}.")
 
@@ -97,7 +182,8 @@ class WebScraper:
                 return (name, url, summary, pricing, analysis, score, fuzzy_score)
         except Exception as e:
             logger.error(f"Error processing {url}: {str(e)}")
-            await browser.close()
+            if browser:
+                await browser.close()
             return (name, url, "Error in processing", "Error in processing", "Error in processing", None, None)
 
 
@@ -24,11 +24,12 @@ MAIN_SCRIPT_CMD = ["python3", "orchestrator.py"]
 # PID file for tracking the main script's process
 PID_FILE = "main.pid"
 
-def start_process(args, max_concurrent_browsers, refresh):
+def start_process(args, max_concurrent_browsers, refresh, profile_startup=False):
     max_concurrent_browsers_arg = ["--max-concurrent-browsers", str(max_concurrent_browsers)]
     refresh_arg = ["--refresh"] if refresh else []
+    profile_startup_arg = ["--profile-startup"] if profile_startup else []
     with open(PID_FILE, 'w') as pid_file:
-        process = subprocess.Popen(MAIN_SCRIPT_CMD + max_concurrent_browsers_arg + refresh_arg + args)
+        process = subprocess.Popen(MAIN_SCRIPT_CMD + max_concurrent_browsers_arg + refresh_arg + profile_startup_arg + args)
         pid_file.write(str(process.pid))
     logging.info("Process started with PID: %s", process.pid)
 
@@ -73,6 +74,7 @@ def main():
     parser.add_argument("--logfile", type=str, default=DEFAULT_LOG_FILE, help="Path to the log file where logs will be written.")
     parser.add_argument("--max-concurrent-browsers", type=int, default=MAX_CONCURRENT_BROWSERS, help="Maximum number of concurrent browsers.")
     parser.add_argument("--refresh", action="store_true", help="Force refresh of cached content.")
+    parser.add_argument("--profile-startup", action="store_true", help="Report import and initialization time per module.")
         
     args = parser.parse_args()
     
@@ -88,7 +90,7 @@ def main():
         main_script_args += ["--output", args.output]
 
     if args.start:
-        start_process(main_script_args, args.max_concurrent_browsers, args.refresh)
+        start_process(main_script_args, args.max_concurrent_browsers, args.refresh, args.profile_startup)
     elif args.stop:
         stop_process()
     elif args.pause: